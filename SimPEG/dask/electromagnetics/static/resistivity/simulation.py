@@ -104,6 +104,8 @@ def dask_getJ(self, m, f=None):
     )
     self._Jmatrix = da.vstack(dask_arrays).rechunk((rowChunk, colChunk))
     self.Ainv.clean()
+    # the factors are gone, so the next call to fields must refactor A
+    self._A_key = None
 
     return self._Jmatrix
 
@@ -36,7 +36,6 @@ class BaseIPSimulation(BaseEMSimulation):
     gtgdiag = None
     sign = None
     _pred = None
-    gtgdiag = None
 
     def fields(self, m=None):
 
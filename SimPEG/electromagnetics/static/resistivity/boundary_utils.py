@@ -179,3 +179,14 @@ def getxBCyBC_CC(mesh, alpha, beta, gamma):
         yBC = np.r_[yBC_x, yBC_y, yBC_z]
 
     return xBC, yBC
+
+
+def _mixed_bc_alpha(x, y, z, normal, source):
+    """
+    alpha coefficient of the mixed boundary condition of Dey and Morrison
+    (1979) on the boundary faces located at (x, y, z), for a source at
+    location source. normal is the axis (0, 1 or 2) normal to each face.
+    """
+    dx, dy, dz = x - source[0], y - source[1], z - source[2]
+    r = 1.0 / np.sqrt(dx ** 2 + dy ** 2 + dz ** 2)
+    return np.choose(normal, (dx, dy, dz)) / r ** 2
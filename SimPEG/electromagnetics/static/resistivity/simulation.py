@@ -1,15 +1,37 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 import numpy as np
 import scipy as sp
+from scipy.linalg.blas import dgemv
 import properties
 from ....utils.code_utils import deprecate_class
 
 from ....utils import mkvc, sdiag, Zero
 from ....data import Data
 from ...base import BaseEMSimulation
-from .boundary_utils import getxBCyBC_CC
+from .boundary_utils import getxBCyBC_CC, _mixed_bc_alpha
 from .survey import Survey
+from .sources import Pole, _eval_poles
 from .fields import Fields3DCellCentered, Fields3DNodal
-from .utils import _mini_pole_pole
+from .utils import _mini_pole_pole, _mini_survey_combine
+
+
+def _remove_null_space(A):
+    """
+    Replace the first row of A with the first row of the identity, working on
+    the CSR data directly instead of assigning the entries one at a time.
+    """
+    A = A.tocsr()
+    row = slice(A.indptr[0], A.indptr[1])
+    A.data[row] = 0.0
+    diag = np.flatnonzero(A.indices[row] == 0)
+    if diag.size > 0:
+        A.data[A.indptr[0] + diag[0]] = 1.0
+    else:
+        A[0, 0] = 1.0
+    return A
 
 
 class BaseDCSimulation(BaseEMSimulation):
@@ -21,10 +43,22 @@ class BaseDCSimulation(BaseEMSimulation):
 
     storeJ = properties.Bool("store the sensitivity matrix?", default=False)
 
+    # The solves with Ainv are still done one at a time, only the projections
+    # and the derivatives of A of each source are formed concurrently
+    n_threads = properties.Integer(
+        "number of threads used to form the sensitivity matrix", default=1, min=1
+    )
+
     _mini_survey = None
 
     Ainv = None
+    _A_key = None
     _Jmatrix = None
+    # If set, the full sensitivity is memory mapped to a file in
+    # sensitivity_path and processed this many rows (or columns) at a time
+    _Jmatrix_chunk_size = None
+    # file the memory mapped _Jmatrix was written to
+    _Jmatrix_file = None
     gtgdiag = None
 
     def __init__(self, *args, **kwargs):
@@ -34,6 +68,11 @@ class BaseDCSimulation(BaseEMSimulation):
         # sources is greater than the number of unique pole sources
         if miniaturize:
             self._dipoles, self._invs, self._mini_survey = _mini_pole_pole(self.survey)
+            self._invs = tuple(self._invs)
+            # indices of the data with an AN, BM and BN contribution
+            self._idx0 = np.flatnonzero(self._dipoles[0])
+            self._idx1 = np.flatnonzero(self._dipoles[1])
+            self._idx01 = np.flatnonzero(self._dipoles[0] & self._dipoles[1])
 
     def fields(self, m=None, calcJ=True):
         if m is not None:
@@ -41,10 +80,19 @@ class BaseDCSimulation(BaseEMSimulation):
             self._Jmatrix = None
 
         f = self.fieldsPair(self)
-        if self.Ainv is not None:
-            self.Ainv.clean()
-        A = self.getA()
-        self.Ainv = self.solver(A, **self.solver_opts)
+        A_key = self._A_dependencies
+        if (
+            A_key is None
+            or self._A_key is None
+            or any(new is not old for new, old in zip(A_key, self._A_key))
+        ):
+            if self.Ainv is not None:
+                self.Ainv.clean()
+            A = self.getA()
+            self.Ainv = self.solver(A, **self.solver_opts)
+            self._A_key = A_key
+        elif self.verbose:
+            print("Reusing the factorization of A, it has not changed.")
         RHS = self.getRHS()
 
         f[:, self._solutionType] = self.Ainv * RHS
@@ -55,7 +103,17 @@ class BaseDCSimulation(BaseEMSimulation):
         if self._Jmatrix is None:
             if f is None:
                 f = self.fields(m)
-            self._Jmatrix = self._Jtvec(m, v=None, f=f).T
+            J = self._Jtvec(m, v=None, f=f).T
+            filename = getattr(J, "filename", None)
+            if self._Jmatrix_file is not None and self._Jmatrix_file != filename:
+                # A J still held elsewhere stays readable once its file is
+                # unlinked, only the space on disk is released
+                try:
+                    os.remove(self._Jmatrix_file)
+                except OSError:
+                    pass
+            self._Jmatrix_file = filename
+            self._Jmatrix = J
         return self._Jmatrix
 
     def dpred(self, m=None, f=None):
@@ -79,14 +137,30 @@ class BaseDCSimulation(BaseEMSimulation):
         if self.gtgdiag is None:
             J = self.getJ(m)
 
-            if W is None:
-                W = np.ones(J.shape[0])
-            else:
+            if W is not None:
                 W = W.diagonal() ** 2
 
-            diag = np.zeros(J.shape[1])
-            for i in range(J.shape[0]):
-                diag += (W[i]) * (J[i] * J[i])
+            if sp.sparse.issparse(J):
+                J2 = J.multiply(J)
+                if W is None:
+                    diag = mkvc(np.asarray(J2.sum(axis=0)))
+                else:
+                    diag = np.asarray(J2.T @ W)
+            else:
+                chunk = self._Jmatrix_chunk_size or max(J.shape[0], 1)
+                diag = np.zeros(J.shape[1])
+                for start in range(0, J.shape[0], chunk):
+                    J_chunk = J[start : start + chunk]
+                    if W is None:
+                        diag += np.einsum("ij,ij->j", J_chunk, J_chunk)
+                    else:
+                        diag += np.einsum(
+                            "i,ij,ij->j",
+                            W[start : start + chunk],
+                            J_chunk,
+                            J_chunk,
+                            optimize=True,
+                        )
 
             self.gtgdiag = diag
         return self.gtgdiag
@@ -101,7 +175,7 @@ class BaseDCSimulation(BaseEMSimulation):
 
         if self.storeJ:
             J = self.getJ(m, f=f)
-            return J.dot(v)
+            return self._J_dot(J, v)
 
         self.model = m
 
@@ -110,17 +184,25 @@ class BaseDCSimulation(BaseEMSimulation):
         else:
             survey = self.survey
 
-        Jv = []
+        # Gather the right hand sides of all sources to solve them at once
+        rhs = []
         for source in survey.source_list:
             u_source = f[source, self._solutionType]  # solution vector
             dA_dm_v = self.getADeriv(u_source, v)
             dRHS_dm_v = self.getRHSDeriv(source, v)
-            du_dm_v = self.Ainv * (-dA_dm_v + dRHS_dm_v)
+            rhs.append(-dA_dm_v + dRHS_dm_v)
+        rhs = np.column_stack(rhs)
+        du_dm_v_block = (self.Ainv * rhs).reshape(rhs.shape, order="F")
+
+        Jv = np.empty(survey.nD)
+        count = 0
+        for i_src, source in enumerate(survey.source_list):
+            du_dm_v = du_dm_v_block[:, i_src]
             for rx in source.receiver_list:
                 df_dmFun = getattr(f, "_{0!s}Deriv".format(rx.projField), None)
                 df_dm_v = df_dmFun(source, du_dm_v, v, adjoint=False)
-                Jv.append(rx.evalDeriv(source, self.mesh, f, df_dm_v))
-        Jv = np.hstack(Jv)
+                Jv[count : count + rx.nD] = rx.evalDeriv(source, self.mesh, f, df_dm_v)
+                count += rx.nD
         return self._mini_survey_data(Jv)
 
     def Jtvec(self, m, v, f=None):
@@ -135,10 +217,33 @@ class BaseDCSimulation(BaseEMSimulation):
 
         if self.storeJ:
             J = self.getJ(m, f=f)
-            return np.asarray(J.T.dot(v))
+            return self._J_dot(J, v, adjoint=True)
 
         return self._Jtvec(m, v=v, f=f)
 
+    @staticmethod
+    def _J_dot(J, v, adjoint=False):
+        """
+            Product of a stored sensitivity matrix (or its transpose) and v.
+            Dense float64 matrices are sent straight to BLAS gemv, using
+            whichever of J or J.T is Fortran ordered to avoid a copy. Any
+            other v (e.g. a block of vectors) goes through dot, which also
+            checks its shape; gemv does not.
+        """
+        if (
+            not isinstance(J, np.ndarray)
+            or J.dtype != np.float64
+            or np.ndim(v) != 1
+            or len(v) != J.shape[0 if adjoint else 1]
+        ):
+            if adjoint:
+                return np.asarray(J.T.dot(v))
+            return J.dot(v)
+        trans = int(adjoint)
+        if not J.flags.f_contiguous and J.flags.c_contiguous:
+            J, trans = J.T, 1 - trans
+        return dgemv(1.0, J, v, trans=trans)
+
     def _Jtvec(self, m, v=None, f=None):
         """
             Compute adjoint sensitivity matrix (J^T) and vector (v) product.
@@ -156,46 +261,145 @@ class BaseDCSimulation(BaseEMSimulation):
             v = self._mini_survey_dataT(v)
             v = Data(survey, v)
             Jtv = np.zeros(m.size)
-        else:
-            # This is for forming full sensitivity matrix
-            Jtv = np.zeros((self.model.size, survey.nD), order="F")
-            istrt = int(0)
-            iend = int(0)
 
-        for source in survey.source_list:
-            u_source = f[source, self._solutionType].copy()
-            for rx in source.receiver_list:
-                # wrt f, need possibility wrt m
-                if v is not None:
+            # Sum the receiver contributions of each source, then solve for
+            # all of the sources at once
+            df_duT_block = []
+            df_dmT_block = []
+            for source in survey.source_list:
+                df_duT_sum = 0
+                df_dmT_sum = Zero()
+                for rx in source.receiver_list:
+                    # wrt f, need possibility wrt m
                     PTv = rx.evalDeriv(
                         source, self.mesh, f, v[source, rx], adjoint=True
                     )
-                else:
-                    # This is for forming full sensitivity matrix
-                    PTv = rx.getP(self.mesh, rx.projGLoc(f)).toarray().T
-                df_duTFun = getattr(f, "_{0!s}Deriv".format(rx.projField), None)
-                df_duT, df_dmT = df_duTFun(source, None, PTv, adjoint=True)
-
-                ATinvdf_duT = self.Ainv * df_duT
+                    df_duTFun = getattr(f, "_{0!s}Deriv".format(rx.projField), None)
+                    df_duT, df_dmT = df_duTFun(source, None, PTv, adjoint=True)
+                    df_duT_sum += df_duT
+                    df_dmT_sum = df_dmT_sum + df_dmT
+                df_duT_block.append(df_duT_sum)
+                df_dmT_block.append(df_dmT_sum)
+            df_duT_block = np.column_stack(df_duT_block)
+            ATinvdf_duT_block = (self.Ainv * df_duT_block).reshape(
+                df_duT_block.shape, order="F"
+            )
+
+            for i_src, source in enumerate(survey.source_list):
+                u_source = f[source, self._solutionType]
+                ATinvdf_duT = ATinvdf_duT_block[:, i_src]
+                df_dmT = df_dmT_block[i_src]
 
                 dA_dmT = self.getADeriv(u_source, ATinvdf_duT, adjoint=True)
                 dRHS_dmT = self.getRHSDeriv(source, ATinvdf_duT, adjoint=True)
                 du_dmT = -dA_dmT + dRHS_dmT
-                if v is not None:
-                    Jtv += (df_dmT + du_dmT).astype(float)
-                else:
-                    iend = istrt + rx.nD
-                    if rx.nD == 1:
-                        Jtv[:, istrt] = df_dmT + du_dmT
-                    else:
-                        Jtv[:, istrt:iend] = df_dmT + du_dmT
-                    istrt += rx.nD
+                # accumulate in place rather than through a temporary sum
+                Jtv += du_dmT
+                if not isinstance(df_dmT, Zero):
+                    Jtv += df_dmT
 
-        if v is not None:
             return mkvc(Jtv)
+
+        # This is for forming full sensitivity matrix
+        # nD of a survey without sources is the float 0.0
+        Jtv = self._empty_sensitivity((self.model.size, int(survey.nD)))
+        # column of Jtv where the data of each source start
+        sources = survey.source_list
+        starts = np.cumsum([0] + [source.nD for source in sources[:-1]])
+        lock = Lock()
+
+        def fill(source, istrt):
+            self._fill_sensitivity(f, source, Jtv, istrt, lock)
+
+        # The first source is done on its own, to build the cached derivative
+        # matrices before the other sources share them
+        if len(sources) > 0:
+            fill(sources[0], starts[0])
+        if self.n_threads > 1:
+            with ThreadPoolExecutor(self.n_threads) as executor:
+                list(executor.map(fill, sources[1:], starts[1:]))
         else:
+            for source, istrt in zip(sources[1:], starts[1:]):
+                fill(source, istrt)
+
+        if self._mini_survey is None or self._Jmatrix_chunk_size is None:
             return (self._mini_survey_data(Jtv.T)).T
 
+        # Expand the miniaturized sensitivity a chunk of model parameters at a
+        # time, so that it never has to be held in memory
+        out = self._empty_sensitivity((self.model.size, int(self.survey.nD)))
+        chunk = self._Jmatrix_chunk_size
+        for start in range(0, self.model.size, chunk):
+            out[start : start + chunk] = (
+                self._mini_survey_data(Jtv[start : start + chunk].T)
+            ).T
+        out.flush()
+        mini_file = Jtv.filename
+        del Jtv
+        os.remove(mini_file)
+        return out
+
+    def _fill_sensitivity(self, f, source, Jtv, istrt, lock):
+        """
+            Fills the columns of the transposed sensitivity Jtv of the data of
+            source, starting at column istrt. The solve with Ainv, which is
+            not thread safe, is done holding lock.
+        """
+        u_source = f[source, self._solutionType]
+        # Stack the receivers of this source to solve for them at once
+        df_duT_block = []
+        df_dmT_block = []
+        for rx in source.receiver_list:
+            # wrt f, need possibility wrt m
+            # the sparse P is cached on rx, only densify it for this source
+            PTv = rx.getP(self.mesh, rx.projGLoc(f)).toarray().T
+            df_duTFun = getattr(f, "_{0!s}Deriv".format(rx.projField), None)
+            df_duT, df_dmT = df_duTFun(source, None, PTv, adjoint=True)
+            df_duT_block.append(df_duT)
+            df_dmT_block.append(df_dmT)
+        df_duT_block = np.hstack(df_duT_block)
+        with lock:
+            ATinvdf_duT = (self.Ainv * df_duT_block).reshape(
+                df_duT_block.shape, order="F"
+            )
+
+        dA_dmT = self.getADeriv(u_source, ATinvdf_duT, adjoint=True)
+        dRHS_dmT = self.getRHSDeriv(source, ATinvdf_duT, adjoint=True)
+        du_dmT = -dA_dmT + dRHS_dmT
+
+        i_col = 0
+        for rx, df_dmT in zip(source.receiver_list, df_dmT_block):
+            iend = istrt + rx.nD
+            if isinstance(df_dmT, Zero):
+                # write straight into J, there is nothing to add
+                Jtv[:, istrt:iend] = du_dmT[:, i_col : i_col + rx.nD]
+            else:
+                Jtv[:, istrt:iend] = df_dmT + du_dmT[:, i_col : i_col + rx.nD]
+            i_col += rx.nD
+            istrt = iend
+
+    def _empty_sensitivity(self, shape):
+        """
+            Zeroed, Fortran ordered array for the transposed sensitivity. It
+            is memory mapped to a new file in sensitivity_path when
+            _Jmatrix_chunk_size is set, so that no other memory mapped
+            sensitivity is ever overwritten.
+        """
+        if self._Jmatrix_chunk_size is None:
+            return np.zeros(shape, order="F")
+        os.makedirs(self.sensitivity_path, exist_ok=True)
+        fd, filename = tempfile.mkstemp(
+            suffix=".npy", prefix="Jt_", dir=self.sensitivity_path
+        )
+        os.close(fd)
+        return np.lib.format.open_memmap(
+            filename,
+            mode="w+",
+            dtype=float,
+            shape=shape,
+            fortran_order=True,
+        )
+
     def getSourceTerm(self):
         """
         Evaluates the sources, and puts them in matrix form
@@ -217,13 +421,31 @@ class BaseDCSimulation(BaseEMSimulation):
 
         q = np.zeros((n, len(Srcs)), order="F")
 
-        for i, source in enumerate(Srcs):
-            q[:, i] = source.eval(self)
+        # Pole sources (e.g. all of those of a miniaturized survey) are
+        # evaluated together, the other sources one by one
+        is_pole = np.array([type(source) is Pole for source in Srcs], dtype=bool)
+        if is_pole.any():
+            poles = [source for source in Srcs if type(source) is Pole]
+            q[:, is_pole] = _eval_poles(poles, self)
+
+        for i in np.flatnonzero(~is_pole):
+            q[:, i] = Srcs[i].eval(self)
         return q
 
+    @property
+    def _A_dependencies(self):
+        """
+        Cached operators the system matrix A is assembled from. The
+        factorization of A is reused for as long as none of them is rebuilt.
+        None (the default) means A is factorized again on every call to fields.
+        """
+        return None
+
     @property
     def deleteTheseOnModelUpdate(self):
         toDelete = super(BaseDCSimulation, self).deleteTheseOnModelUpdate
+        if self._A_key is not None:
+            toDelete += ["_A_key"]
         if self._Jmatrix is not None:
             toDelete += ["_Jmatrix"]
         if self.gtgdiag is not None:
@@ -232,23 +454,32 @@ class BaseDCSimulation(BaseEMSimulation):
 
     def _mini_survey_data(self, d_mini):
         if self._mini_survey is not None:
-            out = d_mini[self._invs[0]]  # AM
-            out[self._dipoles[0]] -= d_mini[self._invs[1]]  # AN
-            out[self._dipoles[1]] -= d_mini[self._invs[2]]  # BM
-            out[self._dipoles[0] & self._dipoles[1]] += d_mini[self._invs[3]]  # BN
+            out = _mini_survey_combine(
+                np.asarray(d_mini).reshape((d_mini.shape[0], -1)),
+                self._invs,
+                self._idx0,
+                self._idx1,
+                self._idx01,
+            ).reshape((-1,) + d_mini.shape[1:])
         else:
             out = d_mini
         return out
 
     def _mini_survey_dataT(self, v):
         if self._mini_survey is not None:
-            out = np.zeros(self._mini_survey.nD)
-            # Need to use ufunc.at because there could be repeated indices
+            nD = self._mini_survey.nD
+            # Need to use bincount because there could be repeated indices
             # That need to be properly handled.
-            np.add.at(out, self._invs[0], v)  # AM
-            np.subtract.at(out, self._invs[1], v[self._dipoles[0]])  # AN
-            np.subtract.at(out, self._invs[2], v[self._dipoles[1]])  # BM
-            np.add.at(out, self._invs[3], v[self._dipoles[0] & self._dipoles[1]])  # BN
+            out = np.bincount(self._invs[0], weights=v, minlength=nD)  # AM
+            out -= np.bincount(
+                self._invs[1], weights=v[self._idx0], minlength=nD
+            )  # AN
+            out -= np.bincount(
+                self._invs[2], weights=v[self._idx1], minlength=nD
+            )  # BM
+            out += np.bincount(
+                self._invs[3], weights=v[self._idx01], minlength=nD
+            )  # BN
             return out
         else:
             out = v
@@ -264,6 +495,8 @@ class Simulation3DCellCentered(BaseDCSimulation):
     _formulation = "HJ"  # CC potentials means J is on faces
     fieldsPair = Fields3DCellCentered
     bc_type = "Dirichlet"
+    # (mesh, bc_type, Div, Grad) of the last call to setBC
+    _bc_geom = None
 
     def __init__(self, mesh, **kwargs):
 
@@ -276,23 +509,28 @@ class Simulation3DCellCentered(BaseDCSimulation):
         A = D MfRhoI G
         """
 
-        D = self.Div
+        D = self.Div.tocsr()
         G = self.Grad
         MfRhoI = self.MfRhoI
-        A = D @ MfRhoI @ G
+        # MfRhoI is diagonal, so scale the columns of D rather than doing a
+        # second sparse matrix product
+        DMfRhoI = D.copy()
+        DMfRhoI.data *= MfRhoI.diagonal()[DMfRhoI.indices]
+        A = DMfRhoI @ G
 
         if self.bc_type == "Neumann":
             if self.verbose:
                 print("Perturbing first row of A to remove nullspace for Neumann BC.")
 
             # Handling Null space of A
-            I, J, V = sp.sparse.find(A[0, :])
-            for jj in J:
-                A[0, jj] = 0.0
-            A[0, 0] = 1.0
+            A = _remove_null_space(A)
 
         return A
 
+    @property
+    def _A_dependencies(self):
+        return (self.MfRhoI, self.Div, self.Grad)
+
     def getADeriv(self, u, v, adjoint=False):
         D = self.Div
         G = self.Grad
@@ -323,13 +561,22 @@ class Simulation3DCellCentered(BaseDCSimulation):
         return Zero()
 
     def setBC(self):
+        # Div and Grad only depend on the mesh and the boundary condition
+        if (
+            self._bc_geom is not None
+            and self._bc_geom[0] is self.mesh
+            and self._bc_geom[1] == self.bc_type
+        ):
+            self.Div, self.Grad = self._bc_geom[2:]
+            return
+
         if self.bc_type == "Dirichlet":
             if self.verbose:
                 print(
                     "Homogeneous Dirichlet is the natural BC for this CC discretization."
                 )
-            self.Div = sdiag(self.mesh.vol) @ self.mesh.faceDiv
-            self.Grad = self.Div.T
+            self.Div = (sdiag(self.mesh.vol) @ self.mesh.faceDiv).tocsr()
+            self.Grad = self.Div.T.tocsr()
 
         else:
             if self.mesh._meshType == "TREE" and self.bc_type == "Neumann":
@@ -345,42 +592,36 @@ class Simulation3DCellCentered(BaseDCSimulation):
                 gBFzp = self.mesh.gridFz[fzp, :]
 
                 # Setup Mixed B.C (alpha, beta, gamma)
-                temp_xm = np.ones_like(gBFxm[:, 0])
-                temp_xp = np.ones_like(gBFxp[:, 0])
-                temp_ym = np.ones_like(gBFym[:, 1])
-                temp_yp = np.ones_like(gBFyp[:, 1])
-                temp_zm = np.ones_like(gBFzm[:, 2])
-                temp_zp = np.ones_like(gBFzp[:, 2])
+                n_xm, n_xp = len(gBFxm), len(gBFxp)
+                n_ym, n_yp = len(gBFym), len(gBFyp)
+                n_zm, n_zp = len(gBFzm), len(gBFzp)
+
+                # the boundary conditions below are all homogeneous
+                gamma_xm, gamma_xp = np.zeros(n_xm), np.zeros(n_xp)
+                gamma_ym, gamma_yp = np.zeros(n_ym), np.zeros(n_yp)
+                gamma_zm, gamma_zp = np.zeros(n_zm), np.zeros(n_zp)
 
                 if self.bc_type == "Neumann":
                     if self.verbose:
                         print("Setting BC to Neumann.")
-                    alpha_xm, alpha_xp = temp_xm * 0.0, temp_xp * 0.0
-                    alpha_ym, alpha_yp = temp_ym * 0.0, temp_yp * 0.0
-                    alpha_zm, alpha_zp = temp_zm * 0.0, temp_zp * 0.0
+                    alpha_xm, alpha_xp = np.zeros(n_xm), np.zeros(n_xp)
+                    alpha_ym, alpha_yp = np.zeros(n_ym), np.zeros(n_yp)
+                    alpha_zm, alpha_zp = np.zeros(n_zm), np.zeros(n_zp)
 
-                    beta_xm, beta_xp = temp_xm, temp_xp
-                    beta_ym, beta_yp = temp_ym, temp_yp
-                    beta_zm, beta_zp = temp_zm, temp_zp
-
-                    gamma_xm, gamma_xp = temp_xm * 0.0, temp_xp * 0.0
-                    gamma_ym, gamma_yp = temp_ym * 0.0, temp_yp * 0.0
-                    gamma_zm, gamma_zp = temp_zm * 0.0, temp_zp * 0.0
+                    beta_xm, beta_xp = np.ones(n_xm), np.ones(n_xp)
+                    beta_ym, beta_yp = np.ones(n_ym), np.ones(n_yp)
+                    beta_zm, beta_zp = np.ones(n_zm), np.ones(n_zp)
 
                 elif self.bc_type == "Dirichlet":
                     if self.verbose:
                         print("Setting BC to Dirichlet.")
-                    alpha_xm, alpha_xp = temp_xm, temp_xp
-                    alpha_ym, alpha_yp = temp_ym, temp_yp
-                    alpha_zm, alpha_zp = temp_zm, temp_zp
-
-                    beta_xm, beta_xp = temp_xm * 0, temp_xp * 0
-                    beta_ym, beta_yp = temp_ym * 0, temp_yp * 0
-                    beta_zm, beta_zp = temp_zm * 0, temp_zp * 0
+                    alpha_xm, alpha_xp = np.ones(n_xm), np.ones(n_xp)
+                    alpha_ym, alpha_yp = np.ones(n_ym), np.ones(n_yp)
+                    alpha_zm, alpha_zp = np.ones(n_zm), np.ones(n_zp)
 
-                    gamma_xm, gamma_xp = temp_xm * 0.0, temp_xp * 0.0
-                    gamma_ym, gamma_yp = temp_ym * 0.0, temp_yp * 0.0
-                    gamma_zm, gamma_zp = temp_zm * 0.0, temp_zp * 0.0
+                    beta_xm, beta_xp = np.zeros(n_xm), np.zeros(n_xp)
+                    beta_ym, beta_yp = np.zeros(n_ym), np.zeros(n_yp)
+                    beta_zm, beta_zp = np.zeros(n_zm), np.zeros(n_zp)
 
                 elif self.bc_type == "Mixed":
                     # Ztop: Neumann
@@ -395,32 +636,23 @@ class Simulation3DCellCentered(BaseDCSimulation):
                     xs = np.median(self.mesh.vectorCCx)
                     ys = np.median(self.mesh.vectorCCy)
                     zs = self.mesh.vectorCCz[-1]
+                    source = np.r_[xs, ys, zs]
+
+                    # Evaluate all of the mixed boundary faces in one call on
+                    # contiguous x, y and z arrays
+                    gBF = [gBFxm, gBFxp, gBFym, gBFyp, gBFzm]
+                    n_gBF = [len(g) for g in gBF]
+                    x, y, z = [np.concatenate([g[:, i] for g in gBF]) for i in range(3)]
+                    normal = np.repeat([0, 0, 1, 1, 2], n_gBF)
+                    alpha_mixed = _mixed_bc_alpha(x, y, z, normal, source)
+                    alpha_xm, alpha_xp, alpha_ym, alpha_yp, alpha_zm = np.split(
+                        alpha_mixed, np.cumsum(n_gBF)[:-1]
+                    )
+                    alpha_zp = np.zeros(n_zp)
 
-                    def r_boundary(x, y, z):
-                        return 1.0 / np.sqrt(
-                            (x - xs) ** 2 + (y - ys) ** 2 + (z - zs) ** 2
-                        )
-
-                    rxm = r_boundary(gBFxm[:, 0], gBFxm[:, 1], gBFxm[:, 2])
-                    rxp = r_boundary(gBFxp[:, 0], gBFxp[:, 1], gBFxp[:, 2])
-                    rym = r_boundary(gBFym[:, 0], gBFym[:, 1], gBFym[:, 2])
-                    ryp = r_boundary(gBFyp[:, 0], gBFyp[:, 1], gBFyp[:, 2])
-                    rzm = r_boundary(gBFzm[:, 0], gBFzm[:, 1], gBFzm[:, 2])
-
-                    alpha_xm = (gBFxm[:, 0] - xs) / rxm ** 2
-                    alpha_xp = (gBFxp[:, 0] - xs) / rxp ** 2
-                    alpha_ym = (gBFym[:, 1] - ys) / rym ** 2
-                    alpha_yp = (gBFyp[:, 1] - ys) / ryp ** 2
-                    alpha_zm = (gBFzm[:, 2] - zs) / rzm ** 2
-                    alpha_zp = temp_zp.copy() * 0.0
-
-                    beta_xm, beta_xp = temp_xm * 1, temp_xp * 1
-                    beta_ym, beta_yp = temp_ym * 1, temp_yp * 1
-                    beta_zm, beta_zp = temp_zm * 1, temp_zp * 1
-
-                    gamma_xm, gamma_xp = temp_xm * 0.0, temp_xp * 0.0
-                    gamma_ym, gamma_yp = temp_ym * 0.0, temp_yp * 0.0
-                    gamma_zm, gamma_zp = temp_zm * 0.0, temp_zp * 0.0
+                    beta_xm, beta_xp = np.ones(n_xm), np.ones(n_xp)
+                    beta_ym, beta_yp = np.ones(n_ym), np.ones(n_yp)
+                    beta_zm, beta_zp = np.ones(n_zm), np.ones(n_zp)
 
                 alpha = [alpha_xm, alpha_xp, alpha_ym, alpha_yp, alpha_zm, alpha_zp]
                 beta = [beta_xm, beta_xp, beta_ym, beta_yp, beta_zm, beta_zp]
@@ -435,19 +667,17 @@ class Simulation3DCellCentered(BaseDCSimulation):
                 gBFyp = self.mesh.gridFy[fyp, :]
 
                 # Setup Mixed B.C (alpha, beta, gamma)
-                temp_xm = np.ones_like(gBFxm[:, 0])
-                temp_xp = np.ones_like(gBFxp[:, 0])
-                temp_ym = np.ones_like(gBFym[:, 1])
-                temp_yp = np.ones_like(gBFyp[:, 1])
+                n_xm, n_xp = len(gBFxm), len(gBFxp)
+                n_ym, n_yp = len(gBFym), len(gBFyp)
 
-                alpha_xm, alpha_xp = temp_xm * 0.0, temp_xp * 0.0
-                alpha_ym, alpha_yp = temp_ym * 0.0, temp_yp * 0.0
+                alpha_xm, alpha_xp = np.zeros(n_xm), np.zeros(n_xp)
+                alpha_ym, alpha_yp = np.zeros(n_ym), np.zeros(n_yp)
 
-                beta_xm, beta_xp = temp_xm, temp_xp
-                beta_ym, beta_yp = temp_ym, temp_yp
+                beta_xm, beta_xp = np.ones(n_xm), np.ones(n_xp)
+                beta_ym, beta_yp = np.ones(n_ym), np.ones(n_yp)
 
-                gamma_xm, gamma_xp = temp_xm * 0.0, temp_xp * 0.0
-                gamma_ym, gamma_yp = temp_ym * 0.0, temp_yp * 0.0
+                gamma_xm, gamma_xp = np.zeros(n_xm), np.zeros(n_xp)
+                gamma_ym, gamma_yp = np.zeros(n_ym), np.zeros(n_yp)
 
                 alpha = [alpha_xm, alpha_xp, alpha_ym, alpha_yp]
                 beta = [beta_xm, beta_xp, beta_ym, beta_yp]
@@ -455,10 +685,12 @@ class Simulation3DCellCentered(BaseDCSimulation):
 
             x_BC, y_BC = getxBCyBC_CC(self.mesh, alpha, beta, gamma)
             V = self.Vol
-            self.Div = V * self.mesh.faceDiv
+            self.Div = (V * self.mesh.faceDiv).tocsr()
             P_BC, B = self.mesh.getBCProjWF_simple()
             M = B * self.mesh.aveCC2F
-            self.Grad = self.Div.T - P_BC * sdiag(y_BC) * M
+            self.Grad = (self.Div.T - P_BC * sdiag(y_BC) * M).tocsr()
+
+        self._bc_geom = (self.mesh, self.bc_type, self.Div, self.Grad)
 
 
 class Simulation3DNodal(BaseDCSimulation):
@@ -477,6 +709,19 @@ class Simulation3DNodal(BaseDCSimulation):
         if mesh._meshType == "TREE":
             mesh.nodalGrad
 
+    @property
+    def Grad(self):
+        """
+        Nodal gradient, stored as CSR
+        """
+        if getattr(self, "_Grad", None) is None:
+            self._Grad = self.mesh.nodalGrad.tocsr()
+        return self._Grad
+
+    @properties.observer("mesh")
+    def _clear_Grad(self, change):
+        self._Grad = None
+
     def getA(self):
         """
         Make the A matrix for the cell centered DC resistivity problem
@@ -484,23 +729,24 @@ class Simulation3DNodal(BaseDCSimulation):
         """
 
         MeSigma = self.MeSigma
-        Grad = self.mesh.nodalGrad
+        Grad = self.Grad
         A = Grad.T @ MeSigma @ Grad
 
         # Handling Null space of A
-        I, J, V = sp.sparse.find(A[0, :])
-        for jj in J:
-            A[0, jj] = 0.0
-        A[0, 0] = 1.0
+        A = _remove_null_space(A)
 
         return A
 
+    @property
+    def _A_dependencies(self):
+        return (self.MeSigma,)
+
     def getADeriv(self, u, v, adjoint=False):
         """
         Product of the derivative of our system matrix with respect to the
         model and a vector
         """
-        Grad = self.mesh.nodalGrad
+        Grad = self.Grad
         if not adjoint:
             return Grad.T @ self.MeSigmaDeriv(Grad @ u, v, adjoint)
         elif adjoint:
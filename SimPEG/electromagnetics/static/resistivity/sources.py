@@ -1,8 +1,9 @@
 import numpy as np
+from scipy.spatial import cKDTree
 import properties
 
 from .... import survey
-from ....utils import Zero, closestPoints
+from ....utils import Zero, closestPoints, mkvc
 from ....utils.code_utils import deprecate_property
 
 import warnings
@@ -147,3 +148,31 @@ class Pole(BaseSrc):
                 q = prob.mesh.getInterpolationMat(self.location, locType="N")
                 self._q = self.current * q.toarray()
             return self._q
+
+
+def _eval_poles(source_list, prob):
+    """
+    Source terms of the Pole sources of source_list, as the columns of an
+    (nC or nN, len(source_list)) array. The poles that were not evaluated yet
+    are all located on the mesh with a single query.
+    """
+    new = [src for src in source_list if src._q is None]
+    if len(new) > 0:
+        locations = np.vstack([np.atleast_2d(src.location) for src in new])
+        if prob._formulation == "HJ":
+            # Like closestPoints, take the lowest index of the equally close
+            # cells, e.g. for an electrode on a cell face
+            k = min(2 ** prob.mesh.dim, prob.mesh.nC)
+            dist, inds = cKDTree(prob.mesh.gridCC).query(locations, k=k)
+            dist = dist.reshape(len(new), -1)
+            inds = inds.reshape(len(new), -1)
+            tied = np.isclose(dist, dist[:, :1], rtol=1e-12, atol=0.0)
+            inds = np.where(tied, inds, prob.mesh.nC).min(axis=1)
+            for src, ind in zip(new, inds):
+                src._q = np.zeros(prob.mesh.nC)
+                src._q[ind] = src.current
+        elif prob._formulation == "EB":
+            Q = prob.mesh.getInterpolationMat(locations, locType="N").tocsr()
+            for i, src in enumerate(new):
+                src._q = src.current * Q[i].toarray()
+    return np.column_stack([mkvc(src._q) for src in source_list])
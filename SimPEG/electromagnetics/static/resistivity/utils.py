@@ -6,6 +6,12 @@ from .survey import Survey
 
 from ..utils import *
 
+# numba is a soft dependency for the miniaturized survey kernel
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 
 def WennerSrcList(nElecs, aSpacing, in2D=False, plotIt=False):
     """
@@ -107,3 +113,46 @@ def _mini_pole_pole(survey, verbose=False):
     invs = [inv_AM, inv_AN, inv_BM, inv_BN]
     mini_survey = Survey(unique_sources)
     return dipoles, invs, mini_survey
+
+
+def _mini_survey_combine_numpy(d_mini, invs, idx_AN, idx_BM, idx_BN):
+    """
+    Combines the rows of d_mini, the pole-pole data (or sensitivities) of
+    a miniaturized survey, into those of the original survey, where invs
+    are the inverses of _mini_pole_pole and idx_* are the indices of the
+    data with an AN, BM and BN contribution.
+    """
+    out = d_mini[invs[0]]  # AM
+    out[idx_AN] -= d_mini[invs[1]]  # AN
+    out[idx_BM] -= d_mini[invs[2]]  # BM
+    out[idx_BN] += d_mini[invs[3]]  # BN
+    return out
+
+
+if njit is not None:
+
+    @njit(cache=True, parallel=True)
+    def _mini_survey_combine(d_mini, invs, idx_AN, idx_BM, idx_BN):
+        """
+        numba version of :code:`_mini_survey_combine_numpy`, d_mini is 2D.
+        The idx_* are unique, so the rows of each loop can be done in parallel.
+        """
+        inv_AM, inv_AN, inv_BM, inv_BN = invs
+        out = np.empty((inv_AM.size, d_mini.shape[1]))
+        for i in prange(inv_AM.size):
+            for j in range(d_mini.shape[1]):
+                out[i, j] = d_mini[inv_AM[i], j]
+        for k in prange(idx_AN.size):
+            for j in range(d_mini.shape[1]):
+                out[idx_AN[k], j] -= d_mini[inv_AN[k], j]
+        for k in prange(idx_BM.size):
+            for j in range(d_mini.shape[1]):
+                out[idx_BM[k], j] -= d_mini[inv_BM[k], j]
+        for k in prange(idx_BN.size):
+            for j in range(d_mini.shape[1]):
+                out[idx_BN[k], j] += d_mini[inv_BN[k], j]
+        return out
+
+
+else:
+    _mini_survey_combine = _mini_survey_combine_numpy
@@ -94,6 +94,14 @@ class DCProblemTestsCC(unittest.TestCase):
         )
         self.assertTrue(passed)
 
+    def test_reuse_Ainv(self):
+        self.p.fields(self.m0)
+        Ainv = self.p.Ainv
+        self.p.fields(self.m0.copy())
+        self.assertIs(self.p.Ainv, Ainv)
+        self.p.fields(2 * self.m0)
+        self.assertIsNot(self.p.Ainv, Ainv)
+
 
 class DCProblemTestsCC_fields(unittest.TestCase):
     def setUp(self):
@@ -235,6 +243,14 @@ class DCProblemTestsN(unittest.TestCase):
         )
         self.assertTrue(passed)
 
+    def test_reuse_Ainv(self):
+        self.p.fields(self.m0)
+        Ainv = self.p.Ainv
+        self.p.fields(self.m0.copy())
+        self.assertIs(self.p.Ainv, Ainv)
+        self.p.fields(2 * self.m0)
+        self.assertIsNot(self.p.Ainv, Ainv)
+
 
 class DCProblemTestsCC_storeJ(unittest.TestCase):
     def setUp(self):
@@ -307,6 +323,29 @@ class DCProblemTestsCC_storeJ(unittest.TestCase):
         )
         self.assertTrue(passed)
 
+    def test_block_v(self):
+        J = self.p.getJ(self.m0)
+        V = np.random.rand(self.mesh.nC, 3)
+        W = np.random.rand(J.shape[0], 2)
+        self.assertTrue(np.allclose(self.p.Jvec(self.m0, V), J.dot(V)))
+        self.assertTrue(np.allclose(self.p.Jtvec(self.m0, W), J.T.dot(W)))
+
+    def test_JtJdiag(self):
+        J = self.p.getJ(self.m0)
+        W = utils.sdiag(np.random.rand(J.shape[0]))
+        JtJdiag = self.p.getJtJdiag(self.m0, W=W)
+        passed = np.allclose(JtJdiag, np.sum((W @ J) ** 2, axis=0))
+        self.assertTrue(passed)
+
+    def test_Jmatrix_chunk_size(self):
+        J = self.p.getJ(self.m0)
+        JtJdiag = self.p.getJtJdiag(self.m0)
+        self.p._Jmatrix = None
+        self.p.gtgdiag = None
+        self.p._Jmatrix_chunk_size = 3
+        self.assertTrue(np.allclose(self.p.getJ(self.m0), J))
+        self.assertTrue(np.allclose(self.p.getJtJdiag(self.m0), JtJdiag))
+
     def tearDown(self):
         # Clean up the working directory
         try:
@@ -394,5 +433,53 @@ class DCProblemTestsN_storeJ(unittest.TestCase):
             pass
 
 
+class DCProblemTestsThreads(unittest.TestCase):
+    def setUp(self):
+
+        self.aSpacing = 2.5
+        self.nElecs = 5
+
+        surveySize = self.nElecs * self.aSpacing - self.aSpacing
+        cs = surveySize / self.nElecs / 4
+
+        self.mesh = discretize.TensorMesh(
+            [
+                [(cs, 10, -1.3), (cs, surveySize / cs), (cs, 10, 1.3)],
+                [(cs, 3, -1.3), (cs, 3, 1.3)],
+            ],
+            "CN",
+        )
+        self.m0 = np.ones(self.mesh.nC)
+
+    def get_J(self, simulation_class, survey=None, **kwargs):
+        if survey is None:
+            # the sources cache their source term on the mesh they are
+            # evaluated on, so each simulation gets its own survey
+            srcList = dc.utils.WennerSrcList(self.nElecs, self.aSpacing, in2D=True)
+            survey = dc.survey.Survey(srcList)
+        simulation = simulation_class(
+            mesh=self.mesh, survey=survey, rhoMap=maps.IdentityMap(self.mesh), **kwargs
+        )
+        return simulation.getJ(self.m0)
+
+    def test_n_threads(self):
+        simulations = [
+            dc.simulation.Simulation3DCellCentered,
+            dc.simulation.Simulation3DNodal,
+        ]
+        for simulation_class in simulations:
+            for miniaturize in [False, True]:
+                with self.subTest(simulation=simulation_class, miniaturize=miniaturize):
+                    J1 = self.get_J(simulation_class, miniaturize=miniaturize)
+                    J2 = self.get_J(
+                        simulation_class, miniaturize=miniaturize, n_threads=2
+                    )
+                    self.assertTrue(np.allclose(J1, J2))
+
+    def test_no_sources(self):
+        J = self.get_J(dc.simulation.Simulation3DNodal, dc.survey.Survey([]))
+        self.assertEqual(J.shape, (0, self.mesh.nC))
+
+
 if __name__ == "__main__":
     unittest.main()
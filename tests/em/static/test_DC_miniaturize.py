@@ -1,10 +1,13 @@
 from SimPEG.electromagnetics.static import resistivity as dc
 from SimPEG.electromagnetics.static.utils.static_utils import gen_DCIPsurvey
+from SimPEG.electromagnetics.static.resistivity import utils as dc_utils
 from SimPEG import maps
 import numpy as np
 from pymatsolver import Pardiso
 import discretize
 import os
+import shutil
+import tempfile
 
 my_dir = os.path.dirname(__file__)
 import unittest
@@ -304,6 +307,85 @@ class DC3DMiniaturizeTest(unittest.TestCase):
         J2 = self.sim2.getJ(self.model, f=self.f2)
         self.assertTrue(np.allclose(J1, J2))
 
+    def test_J_chunked(self):
+        J1 = self.sim1.getJ(self.model, f=self.f1)
+        self.sim2.sensitivity_path = tempfile.mkdtemp()
+        self.sim2._Jmatrix_chunk_size = 3
+        try:
+            J2 = self.sim2.getJ(self.model, f=self.f2)
+            self.assertTrue(np.allclose(J1, J2))
+            # only the expanded sensitivity is left on disk
+            self.assertEqual(len(os.listdir(self.sim2.sensitivity_path)), 1)
+
+            # a new sensitivity does not overwrite the one still held
+            self.sim2._Jmatrix = None
+            J3 = self.sim2.getJ(self.model, f=self.f2)
+            self.assertTrue(np.allclose(J2, J1))
+            self.assertTrue(np.allclose(J3, J1))
+        finally:
+            shutil.rmtree(self.sim2.sensitivity_path)
+
+
+@unittest.skipIf(dc_utils.njit is None, "numba is not installed")
+class MiniSurveyCombineTest(unittest.TestCase):
+    """
+    The numba kernel combining miniaturized data matches the NumPy version
+    """
+
+    def setUp(self):
+        survey_end_points = np.array([[-5.0, 0, 0], [5.0, 0, 0]])
+        survey = gen_DCIPsurvey(survey_end_points, "dipole-dipole", 2.5, 2.5, 5, dim=2)
+        dipoles, invs, mini_survey = dc_utils._mini_pole_pole(survey)
+        self.nD_mini = mini_survey.nD
+        self.args = (
+            tuple(invs),
+            np.flatnonzero(dipoles[0]),
+            np.flatnonzero(dipoles[1]),
+            np.flatnonzero(dipoles[0] & dipoles[1]),
+        )
+
+    def test_vector(self):
+        d_mini = np.random.rand(self.nD_mini, 1)
+        d1 = dc_utils._mini_survey_combine(d_mini, *self.args)
+        d2 = dc_utils._mini_survey_combine_numpy(d_mini, *self.args)
+        self.assertTrue(np.allclose(d1, d2))
+
+    def test_matrix(self):
+        d_mini = np.random.rand(self.nD_mini, 7)
+        d1 = dc_utils._mini_survey_combine(d_mini, *self.args)
+        d2 = dc_utils._mini_survey_combine_numpy(d_mini, *self.args)
+        self.assertTrue(np.allclose(d1, d2))
+
+
+class EvalPolesTest(unittest.TestCase):
+    """
+    Evaluating all of the pole sources at once matches evaluating them one
+    by one, including for electrodes between cells.
+    """
+
+    def setUp(self):
+        self.mesh = discretize.TensorMesh([8, 8, 8], x0="CCN")
+        x = np.linspace(-0.5, 0.5, 9)
+        self.locations = np.c_[x, np.zeros_like(x), np.zeros_like(x)]
+
+    def check_poles(self, simulation_class):
+        poles = [dc.sources.Pole([], loc) for loc in self.locations]
+        simulation = simulation_class(
+            mesh=self.mesh,
+            survey=dc.Survey(poles),
+            sigmaMap=maps.IdentityMap(self.mesh),
+        )
+        q1 = dc.sources._eval_poles(poles, simulation)
+        poles = [dc.sources.Pole([], loc) for loc in self.locations]
+        q2 = np.column_stack([np.ravel(src.eval(simulation)) for src in poles])
+        self.assertTrue(np.allclose(q1, q2))
+
+    def test_cell_centered(self):
+        self.check_poles(dc.Simulation3DCellCentered)
+
+    def test_nodal(self):
+        self.check_poles(dc.Simulation3DNodal)
+
 
 if __name__ == "__main__":
     unittest.main()